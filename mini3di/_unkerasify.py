@@ -69,6 +69,11 @@ class KerasifyParser:
         self.file.readinto(v)  # type: ignore
         return v
 
+    def _read_array(self, count: int) -> numpy.ndarray:
+        array = numpy.empty(count, dtype="=f4")
+        self.file.readinto(memoryview(array).cast("B"))  # type: ignore
+        return array
+
     def _get(self, format: str) -> typing.Tuple[typing.Any, ...]:
         v = self._read(format)
         return struct.unpack(format, v)
@@ -83,12 +88,8 @@ class KerasifyParser:
             (w0,) = self._get("I")
             (w1,) = self._get("I")
             (b0,) = self._get("I")
-            weights = (
-                numpy.frombuffer(self._read(f"={w0*w1}f"), dtype="f4")
-                .reshape(w0, w1)
-                .copy()
-            )
-            biases = numpy.frombuffer(self._read(f"={b0}f"), dtype="f4").copy()
+            weights = self._read_array(w0 * w1).reshape(w0, w1)
+            biases = self._read_array(b0)
             activation = ActivationType(self._get("I")[0])
             if activation not in (ActivationType.LINEAR, ActivationType.RELU):
                 raise NotImplementedError(f"Unsupported activation type: {activation!r}")
@@ -31,6 +31,22 @@ if typing.TYPE_CHECKING:
 
 DISTANCE_ALPHA_BETA = 1.5336
 ALPHABET = numpy.array(list("ACDEFGHIKLMNPQRSTVWYX"))
+_BACKBONE_ATOMS = {"CA": 0, "CB": 1, "CB A": 1, "N": 2, "C": 3}
+_SQRT_8_3 = numpy.sqrt(8) / 3.0
+_HALF_SQRT_3 = numpy.sqrt(3) / 2.0
+
+
+@functools.lru_cache(maxsize=1)
+def _load_vae_layers() -> typing.Tuple[Layer, ...]:
+    """Load the layers of the ``foldseek`` VQ-VAE encoder.
+
+    The parsed layers are cached so that they are shared by all `Encoder`
+    instances rather than parsed again for each of them.
+
+    """
+    path = resource_files(__package__).joinpath("encoder_weights_3di.kerasify")
+    with path.open("rb") as f:
+        return tuple(_unkerasify.load(f))
 
 
 class _BaseEncoder(abc.ABC, typing.Generic[T]):
@@ -81,32 +97,76 @@ class _BaseEncoder(abc.ABC, typing.Generic[T]):
         .. versionadded:: 0.2.0
            The ``disordered_atom`` argument.
 
+        """
+        ca, cb, n, c = self._extract_coordinates(chain, ca_residue, disordered_atom)
+        return self.encode_atoms(ca, cb, n, c)
+
+    def encode_chains(
+        self,
+        chains: typing.Iterable[Chain],
+        ca_residue: bool = True,
+        disordered_atom: Literal["best", "last"] = "best",
+    ) -> typing.List[T]:
+        """Encode several chains to a different representation.
+
+        Arguments:
+            chains (iterable of `Bio.PDB.Chain`): The chain objects to
+                encode, parsed from one or more PDB structures.
+            ca_residue (`bool`, *optional*): Only extract coordinates of
+                residues which have a *CA* atom.
+            disordered_atom (`str`): How to handle disordered atoms in the
+                source chains.
+
+        Returns:
+            `list`: A list containing the encoding of each chain, in the
+            same order as the input chains.
+
+        See Also:
+            `~_BaseEncoder.encode_chain` for more details about the
+            keyword arguments.
+
+        .. versionadded:: 0.3.0
+
+        """
+        return [
+            self.encode_chain(chain, ca_residue, disordered_atom)
+            for chain in chains
+        ]
+
+    def _extract_coordinates(
+        self,
+        chain: Chain,
+        ca_residue: bool = True,
+        disordered_atom: Literal["best", "last"] = "best",
+    ) -> typing.Tuple[
+        ArrayNx3[numpy.float32],
+        ArrayNx3[numpy.float32],
+        ArrayNx3[numpy.float32],
+        ArrayNx3[numpy.float32],
+    ]:
+        """Extract the coordinates of the backbone atoms from a chain.
         """
         # extract residues
         if ca_residue:
             residues = [residue for residue in chain.get_residues() if "CA" in residue]
         else:
             residues = list(chain.get_residues())
-        # extract atom coordinates
-        r = len(residues)
-        ca = numpy.array(numpy.nan, dtype=numpy.float32).repeat(3 * r).reshape(r, 3)
-        cb = ca.copy()
-        n = ca.copy()
-        c = ca.copy()
+        # extract atom coordinates into a single buffer
+        coords = numpy.full((len(residues), 4, 3), numpy.nan, dtype=numpy.float32)
         for i, residue in enumerate(residues):
-            for atom in residue.get_atoms():
-                if atom.is_disordered() and disordered_atom == "last":
-                    atom = last(atom)
-                if atom.get_name() == "CA":
-                    ca[i, :] = atom.coord
-                elif atom.get_name() == "N":
-                    n[i, :] = atom.coord
-                elif atom.get_name() == "C":
-                    c[i, :] = atom.coord
-                elif atom.get_name() == "CB" or atom.get_name() == "CB A":
-                    cb[i, :] = atom.coord
-        # encode coordinates
-        return self.encode_atoms(ca, cb, n, c)
+            # point mutations are stored as a `DisorderedResidue`, which
+            # does not forward `child_dict` to the selected residue
+            if residue.is_disordered() == 2:
+                residue = residue.selected_child
+            atoms = residue.child_dict
+            for name, j in _BACKBONE_ATOMS.items():
+                atom = atoms.get(name)
+                if atom is not None:
+                    if atom.is_disordered() and disordered_atom == "last":
+                        atom = last(atom)
+                    coords[i, j] = atom.coord
+        ca, cb, n, c = coords.transpose(1, 0, 2)
+        return ca, cb, n, c
 
 
 class VirtualCenterEncoder(_BaseEncoder["ArrayNx3[numpy.float32]"]):
@@ -159,6 +219,7 @@ class VirtualCenterEncoder(_BaseEncoder["ArrayNx3[numpy.float32]"]):
         self._theta = numpy.deg2rad(theta)
         self._cos_theta = numpy.cos(self._theta)
         self._sin_theta = numpy.sin(self._theta)
+        self._versin_theta = 1 - self._cos_theta
 
     @property
     def tau(self) -> float:
@@ -169,6 +230,31 @@ class VirtualCenterEncoder(_BaseEncoder["ArrayNx3[numpy.float32]"]):
         self._tau = numpy.deg2rad(tau)
         self._cos_tau = numpy.cos(self._tau)
         self._sin_tau = numpy.sin(self._tau)
+        self._versin_tau = 1 - self._cos_tau
+
+    @staticmethod
+    def _rotate(
+        v: ArrayNx3[numpy.floating],
+        k: ArrayNx3[numpy.floating],
+        cos: float,
+        sin: float,
+        versin: float,
+        out: ArrayNx3[numpy.floating],
+        buffer: ArrayNx3[numpy.floating],
+    ) -> None:
+        """Rotate ``v`` around the unit axes ``k`` and store it in ``out``.
+
+        Note:
+            ``out`` can be ``v`` itself to rotate the vectors in place.
+
+        """
+        kxv = numpy.cross(k, v)
+        kv = numpy.einsum("ij,ij->i", k, v)[:, None]
+        numpy.multiply(v, cos, out=out)
+        out += numpy.multiply(kxv, sin, out=buffer)
+        numpy.multiply(k, kv, out=buffer)
+        buffer *= versin
+        out += buffer
 
     def _compute_virtual_center(
         self,
@@ -178,23 +264,38 @@ class VirtualCenterEncoder(_BaseEncoder["ArrayNx3[numpy.float32]"]):
     ) -> ArrayNx3[numpy.floating]:
         assert ca.shape == n.shape
         assert ca.shape == cb.shape
-        v = cb - ca
+        # use the promoted type of the rotation for all intermediate buffers
+        dtype = numpy.result_type(cb, ca, self._cos_theta, self._cos_tau)
+        v = numpy.empty(ca.shape, dtype=dtype)
+        buffer = numpy.empty(ca.shape, dtype=dtype)
         a = cb - ca
         b = n - ca
-        # normal angle
-        k = normalize(numpy.cross(a, b, axis=-1), inplace=True)
-        v = (
-            v * self._cos_theta
-            + numpy.cross(k, v) * self._sin_theta
-            + k * (k * v).sum(axis=-1).reshape(-1, 1) * (1 - self._cos_theta)
-        )
-        # dihedral angle
-        k = normalize(n - ca, inplace=True)
-        v = (
-            v * self._cos_tau
-            + numpy.cross(k, v) * self._sin_tau
-            + k * (k * v).sum(axis=-1).reshape(-1, 1) * (1 - self._cos_tau)
-        )
+        # normal angle (skipped for the identity rotation)
+        if self._sin_theta != 0 or self._cos_theta != 1:
+            k = normalize(numpy.cross(a, b, axis=-1), inplace=True)
+            self._rotate(
+                a,
+                k,
+                self._cos_theta,
+                self._sin_theta,
+                self._versin_theta,
+                out=v,
+                buffer=buffer,
+            )
+        else:
+            v[:] = a
+        # dihedral angle (skipped for the identity rotation, e.g. τ=0)
+        if self._sin_tau != 0 or self._cos_tau != 1:
+            k = normalize(b, inplace=True)
+            self._rotate(
+                v,
+                k,
+                self._cos_tau,
+                self._sin_tau,
+                self._versin_tau,
+                out=v,
+                buffer=buffer,
+            )
         # apply final vector to Cα
         v *= self.distance_alpha_v
         v += ca
@@ -218,7 +319,13 @@ class VirtualCenterEncoder(_BaseEncoder["ArrayNx3[numpy.float32]"]):
         u1 = normalize(b1, inplace=True)
         u2 = normalize(b2, inplace=True)
 
-        out = (numpy.sqrt(8) / 3.0) * ((-u1 / 2.0) - (u2 * numpy.sqrt(3) / 2.0)) - v3
+        # scaling by powers of two is exact, so this reorders the original
+        # `sqrt(8)/3 * ((-u1 / 2) - (u2 * sqrt(3) / 2)) - v3` in place
+        out = numpy.multiply(u2, _HALF_SQRT_3)
+        u1 *= -0.5
+        numpy.subtract(u1, out, out=out)
+        out *= _SQRT_8_3
+        out -= v3
         out *= self.distance_alpha_beta
         out += ca
         return out
@@ -228,21 +335,21 @@ class VirtualCenterEncoder(_BaseEncoder["ArrayNx3[numpy.float32]"]):
         ca: ArrayNx3[numpy.floating],
         n: ArrayNx3[numpy.floating],
         c: ArrayNx3[numpy.floating],
-    ) -> ArrayNx3[numpy.bool_]:
-        """Mask any column which contains at least one NaN value.
+    ) -> ArrayN[numpy.bool_]:
+        """Mask any residue which contains at least one NaN value.
         """
-        mask_ca = numpy.isnan(ca).max(axis=1)
-        mask_n = numpy.isnan(n).max(axis=1)
-        mask_c = numpy.isnan(c).max(axis=1)
-        return (mask_ca | mask_n | mask_c).repeat(3).reshape(-1, 3)
+        # check the coordinates of all atoms of a residue in a single pass
+        return numpy.isnan(numpy.concatenate((ca, n, c), axis=1)).any(axis=1)
 
-    def encode_atoms(
+    def _encode_atoms(
         self,
         ca: ArrayNx3[numpy.floating],
         cb: ArrayNx3[numpy.floating],
         n: ArrayNx3[numpy.floating],
         c: ArrayNx3[numpy.floating],
-    ) -> ArrayNx3[numpy.float32]:
+    ) -> typing.Tuple[ArrayNx3[numpy.floating], ArrayN[numpy.bool_]]:
+        """Compute the virtual centers and the mask of invalid residues.
+        """
         ca = numpy.asarray(ca)
         cb = numpy.asarray(cb)
         n = numpy.asarray(n)
@@ -262,9 +369,19 @@ class VirtualCenterEncoder(_BaseEncoder["ArrayNx3[numpy.float32]"]):
         # compute virtual center
         vc = self._compute_virtual_center(ca, cb, n)
         # mask residues without coordinates
+        return vc, self._create_nan_mask(ca, n, c)
+
+    def encode_atoms(
+        self,
+        ca: ArrayNx3[numpy.floating],
+        cb: ArrayNx3[numpy.floating],
+        n: ArrayNx3[numpy.floating],
+        c: ArrayNx3[numpy.floating],
+    ) -> ArrayNx3[numpy.float32]:
+        vc, mask = self._encode_atoms(ca, cb, n, c)
         return numpy.ma.masked_array(  # type: ignore
             vc,
-            mask=self._create_nan_mask(ca, n, c),
+            mask=mask.repeat(3).reshape(-1, 3),
             fill_value=numpy.nan,
         )
 
@@ -279,21 +396,73 @@ class PartnerIndexEncoder(_BaseEncoder["ArrayN[numpy.int64]"]):
 
     """
 
+    _TILE_SIZE = 256
+
     def __init__(self) -> None:
         self.vc_encoder = VirtualCenterEncoder()
 
+    @staticmethod
+    def _update_partners(
+        D: ArrayNxM[numpy.floating],
+        best: ArrayN[numpy.floating],
+        partners: ArrayN[numpy.int64],
+        offset: int,
+    ) -> None:
+        index = D.argmin(axis=1)
+        dist = D[numpy.arange(D.shape[0]), index]
+        closer = dist < best
+        best[closer] = dist[closer]
+        partners[closer] = index[closer] + offset
+
     def _find_residue_partners(
         self,
         x: ArrayNx3[numpy.floating],
+        mask: ArrayN[numpy.bool_],
     ) -> ArrayN[numpy.int64]:
-        # compute pairwise squared distance matrix
-        r = numpy.sum(x * x, axis=-1).reshape(-1, 1)
-        r[0] = r[-1] = numpy.nan
-        D = r - 2 * numpy.ma.dot(x, x.T) + r.T
-        # avoid selecting residue itself as the best
-        D[numpy.diag_indices_from(D)] = numpy.inf
-        # get the closest non-masked residue
-        return numpy.nan_to_num(D, copy=False, nan=numpy.inf).argmin(axis=1)
+        # only search partners among residues that are not masked and have
+        # finite coordinates, and exclude the terminal residues
+        valid = ~mask & numpy.isfinite(x).all(axis=1)
+        valid[0] = valid[-1] = False
+        indices = numpy.flatnonzero(valid)
+        x = x[indices]
+        # rank candidates with half squared distances, which only differ
+        # from squared distances by an exact factor of two
+        h = numpy.einsum("ij,ij->i", x, x)
+        h /= 2
+        # process the pairwise squared distance matrix by blocks, only
+        # computing the blocks of the upper triangle since it is symmetric
+        n = x.shape[0]
+        t = max(min(self._TILE_SIZE, n), 1)
+        best = numpy.full(n, numpy.inf, dtype=h.dtype)
+        local = numpy.arange(n)
+        # reuse the same buffers for all the blocks
+        D_buffer = numpy.empty((t, t), dtype=h.dtype)
+        G_buffer = numpy.empty((t, t), dtype=h.dtype)
+        for i in range(0, n, t):
+            xi = x[i:i+t]
+            for j in range(i, n, t):
+                xj = x[j:j+t]
+                D = D_buffer[:xi.shape[0], :xj.shape[0]]
+                G = G_buffer[:xi.shape[0], :xj.shape[0]]
+                # compute (h_i + h_j) - x_i.x_j in place
+                numpy.matmul(xi, xj.T, out=G)
+                numpy.add(h[i:i+t, None], h[j:j+t], out=D)
+                D -= G
+                # avoid selecting residue itself as the best
+                if i == j:
+                    D[numpy.diag_indices_from(D)] = numpy.inf
+                # update the closest residues for the rows of the block,
+                # and for its columns when off the diagonal; blocks are
+                # visited by increasing column index, so keeping the
+                # current best on ties selects the first minimum
+                self._update_partners(D, best[i:i+t], local[i:i+t], j)
+                if i != j:
+                    self._update_partners(D.T, best[j:j+t], local[j:j+t], i)
+        # map partners back to residue indices, using the residue itself
+        # for residues without a partner
+        partners = numpy.arange(valid.shape[0])
+        partners[indices] = indices[local]
+        return partners
 
     def encode_atoms(
         self,
@@ -303,15 +472,17 @@ class PartnerIndexEncoder(_BaseEncoder["ArrayN[numpy.int64]"]):
         c: ArrayNx3[numpy.floating],
     ) -> ArrayN[numpy.int64]:
         # encode backbone atoms to virtual center
-        vc = self.vc_encoder.encode_atoms(ca, cb, n, c)
+        vc, mask = self.vc_encoder._encode_atoms(ca, cb, n, c)
         # find closest neighbor for each residue
-        return self._find_residue_partners(vc)
+        return self._find_residue_partners(vc, mask)
 
 
 class FeatureEncoder(_BaseEncoder["ArrayN[numpy.float32]"]):
     """An encoder for converting a protein structure to structural descriptors.
     """
 
+    _log_table = numpy.log(numpy.arange(1, 1025, dtype=numpy.float64))
+
     def __init__(self) -> None:
         self.partner_index_encoder = PartnerIndexEncoder()
         self.vc_encoder = self.partner_index_encoder.vc_encoder
@@ -320,63 +491,109 @@ class FeatureEncoder(_BaseEncoder["ArrayN[numpy.float32]"]):
         self,
         ca: ArrayNx3[numpy.floating],
         partner_index: ArrayN[numpy.int64],
+        mask: ArrayN[numpy.bool_],
         dtype: typing.Type[numpy.floating] = numpy.float32,
     ) -> ArrayNx10[numpy.floating]:
-        # build arrays of indices to use for vectorized angles
-        n = ca.shape[0]
-        I = numpy.arange(1, ca.shape[-2] - 1)
+        # build arrays of indices to use for vectorized angles, only
+        # for the residues that are not masked (masked rows stay zero)
+        I = numpy.flatnonzero(~mask)
         J = partner_index[I]
+        # normalize the backbone edges once, `edges[k]` going from residue
+        # `k` to `k + 1` (terminal residues are always masked, so both `I`
+        # and `J` have a previous and a next edge)
+        edges = normalize(ca[1:] - ca[:-1], inplace=True)
         # compute conformational descriptors
-        u1 = normalize(ca[..., I, :] - ca[..., I - 1, :], inplace=True)
-        u2 = normalize(ca[..., I + 1, :] - ca[..., I, :], inplace=True)
-        u3 = normalize(ca[..., J, :] - ca[..., J - 1, :], inplace=True)
-        u4 = normalize(ca[..., J + 1, :] - ca[..., J, :], inplace=True)
-        u5 = normalize(ca[..., J, :] - ca[..., I, :], inplace=True)
+        u1 = edges[I - 1]
+        u2 = edges[I]
+        u3 = edges[J - 1]
+        u4 = edges[J]
+        # use the same difference for the partner distance and direction
+        u5 = ca[J] - ca[I]
+        dist = numpy.sqrt(numpy.einsum("ij,ij->i", u5, u5))
+        numpy.divide(u5, dist[:, None], out=u5, where=dist[:, None] != 0)
         desc = numpy.zeros((ca.shape[0], 10), dtype=dtype)
-        desc[I, 0] = numpy.sum(u1 * u2, axis=-1)
-        desc[I, 1] = numpy.sum(u3 * u4, axis=-1)
-        desc[I, 2] = numpy.sum(u1 * u5, axis=-1)
-        desc[I, 3] = numpy.sum(u3 * u5, axis=-1)
-        desc[I, 4] = numpy.sum(u1 * u4, axis=-1)
-        desc[I, 5] = numpy.sum(u2 * u3, axis=-1)
-        desc[I, 6] = numpy.sum(u1 * u3, axis=-1)
-        desc[I, 7] = numpy.linalg.norm(ca[I] - ca[J], axis=-1)
+        desc[I, 0] = numpy.einsum("ij,ij->i", u1, u2)
+        desc[I, 1] = numpy.einsum("ij,ij->i", u3, u4)
+        desc[I, 2] = numpy.einsum("ij,ij->i", u1, u5)
+        desc[I, 3] = numpy.einsum("ij,ij->i", u3, u5)
+        desc[I, 4] = numpy.einsum("ij,ij->i", u1, u4)
+        desc[I, 5] = numpy.einsum("ij,ij->i", u2, u3)
+        desc[I, 6] = numpy.einsum("ij,ij->i", u1, u3)
+        desc[I, 7] = dist
         desc[I, 8] = numpy.clip(J - I, -4, 4)
-        desc[I, 9] = numpy.copysign(numpy.log(numpy.abs(J - I) + 1), J - I)
+        desc[I, 9] = numpy.copysign(self._log_sequence_distance(J - I), J - I)
         return desc
 
+    @classmethod
+    def _log_sequence_distance(
+        cls,
+        d: ArrayN[numpy.int64],
+    ) -> ArrayN[numpy.float64]:
+        """Compute ``log(|d| + 1)`` with a table lookup.
+
+        The table of logarithms is shared between all instances, and
+        grown (at least twice its size) when a chain longer than any
+        seen before is encoded.
+
+        """
+        ad = numpy.abs(d)
+        table = cls._log_table
+        if ad.size and ad.max() >= table.shape[0]:
+            size = max(int(ad.max()) + 1, 2 * table.shape[0])
+            table = numpy.log(numpy.arange(1, size + 1, dtype=numpy.float64))
+            cls._log_table = table
+        return table[ad]
+
     def _create_descriptor_mask(
         self,
         mask: ArrayN[numpy.bool_],
         partner_index: ArrayN[numpy.int64],
-    ) -> ArrayNx10[numpy.bool_]:
+    ) -> ArrayN[numpy.bool_]:
         I = numpy.arange(1, mask.shape[0] - 1)
         J = partner_index[I]
-        out = numpy.zeros((mask.shape[0], 10), dtype=numpy.bool_)
-        out[1:-1, :] |= (
+        out = numpy.zeros(mask.shape[0], dtype=numpy.bool_)
+        out[1:-1] = (
             mask[I - 1] | mask[I] | mask[I + 1] | mask[J - 1] | mask[J] | mask[J + 1]
-        ).reshape(mask.shape[0]-2, 1)
+        )
         out[0] = out[-1] = True
         return out
 
-    def encode_atoms(
+    def _encode_atoms(
         self,
         ca: ArrayNx3[numpy.floating],
         cb: ArrayNx3[numpy.floating],
         n: ArrayNx3[numpy.floating],
         c: ArrayNx3[numpy.floating],
-    ) -> ArrayN[numpy.uint8]:
+    ) -> typing.Tuple[ArrayNx10[numpy.floating], ArrayN[numpy.bool_]]:
+        """Compute the descriptors and the mask of invalid residues.
+        """
+        # convert coordinates once for all the stages of the pipeline,
+        # using single precision like the VAE weights
+        ca = numpy.asarray(ca, dtype=numpy.float32)
+        cb = numpy.asarray(cb, dtype=numpy.float32)
+        n = numpy.asarray(n, dtype=numpy.float32)
+        c = numpy.asarray(c, dtype=numpy.float32)
         # encode backbone atoms to virtual center
-        vc = self.vc_encoder.encode_atoms(ca, cb, n, c)
+        vc, vc_mask = self.vc_encoder._encode_atoms(ca, cb, n, c)
         # find closest neighbor for each residue
-        partner_index = self.partner_index_encoder._find_residue_partners(vc)
-        # build position features from residue angles
-        descriptors = self._calc_conformation_descriptors(ca, partner_index)
+        partner_index = self.partner_index_encoder._find_residue_partners(vc, vc_mask)
         # create mask
-        mask = self._create_descriptor_mask(vc.mask[:, 0], partner_index)
+        mask = self._create_descriptor_mask(vc_mask, partner_index)
+        # build position features from residue angles
+        descriptors = self._calc_conformation_descriptors(ca, partner_index, mask)
+        return descriptors, mask
+
+    def encode_atoms(
+        self,
+        ca: ArrayNx3[numpy.floating],
+        cb: ArrayNx3[numpy.floating],
+        n: ArrayNx3[numpy.floating],
+        c: ArrayNx3[numpy.floating],
+    ) -> ArrayNx10[numpy.float32]:
+        descriptors, mask = self._encode_atoms(ca, cb, n, c)
         return numpy.ma.masked_array(  # type: ignore
             descriptors,
-            mask=mask,
+            mask=mask.repeat(10).reshape(-1, 10),
             fill_value=numpy.nan,
         )
 
@@ -408,14 +625,14 @@ class Encoder(_BaseEncoder["ArrayN[numpy.uint8]"]):
             [0.7786, -2.1660],
             [-2.3030, 0.3813],
             [1.0290, 0.8772],
-        ]
+        ],
+        dtype=numpy.float32,
     )
 
     def __init__(self) -> None:
         self.feature_encoder = FeatureEncoder()
-        with resource_files(__package__).joinpath("encoder_weights_3di.kerasify").open("rb") as f:
-            layers = _unkerasify.load(f)
-            layers.append(CentroidLayer(self._CENTROIDS))
+        layers = list(_load_vae_layers())
+        layers.append(CentroidLayer(self._CENTROIDS))
         self.vae_encoder = Model(layers)
 
     def encode_atoms(
@@ -425,14 +642,43 @@ class Encoder(_BaseEncoder["ArrayN[numpy.uint8]"]):
         n: ArrayNx3[numpy.floating],
         c: ArrayNx3[numpy.floating],
     ) -> ArrayN[numpy.uint8]:
-        descriptors = self.feature_encoder.encode_atoms(ca, cb, n, c)
-        states = self.vae_encoder(descriptors.data)
+        descriptors, mask = self.feature_encoder._encode_atoms(ca, cb, n, c)
+        states = self.vae_encoder(descriptors)
         return numpy.ma.masked_array(
             states,
-            mask=descriptors.mask[:, 0],
+            mask=mask,
             fill_value=self._INVALID_STATE,
         )
 
+    def encode_chains(
+        self,
+        chains: typing.Iterable[Chain],
+        ca_residue: bool = True,
+        disordered_atom: Literal["best", "last"] = "best",
+    ) -> typing.List[ArrayN[numpy.uint8]]:
+        # compute the descriptors of each chain independently
+        features = [
+            self.feature_encoder._encode_atoms(
+                *self._extract_coordinates(chain, ca_residue, disordered_atom)
+            )
+            for chain in chains
+        ]
+        if not features:
+            return []
+        # run the VAE once on the descriptors of all chains
+        descriptors = numpy.concatenate([desc for desc, _ in features])
+        states = self.vae_encoder(descriptors)
+        # split states back to their source chain
+        offsets = numpy.cumsum([desc.shape[0] for desc, _ in features[:-1]])
+        return [
+            numpy.ma.masked_array(
+                chain_states,
+                mask=mask,
+                fill_value=self._INVALID_STATE,
+            )
+            for chain_states, (_, mask) in zip(numpy.split(states, offsets), features)
+        ]
+
     def build_sequence(self, states: ArrayN[numpy.uint8]) -> str:
         return "".join( ALPHABET[states.filled()] )
 
@@ -3,7 +3,6 @@
 from __future__ import annotations
 
 import abc
-import functools
 import typing
 from typing import Iterable, Optional
 
@@ -29,31 +28,42 @@ class DenseLayer(Layer):
         activation: bool = True
     ):
         self.activation = activation
-        self.weights = numpy.asarray(weights)
+        # keep the parameters as C-contiguous read-only views (copying only
+        # if needed) so that every call hands the same operands to the GEMM,
+        # using a floating type so that inputs are never truncated
+        dtype = numpy.result_type(numpy.asarray(weights), numpy.float32)
+        self.weights = numpy.ascontiguousarray(weights, dtype=dtype).view()
         if biases is None:
-            self.biases = numpy.zeros(self.weights.shape[1])
+            self.biases = numpy.zeros(self.weights.shape[1], dtype=dtype)
         else:
-            self.biases = numpy.asarray(biases)
+            self.biases = numpy.asarray(biases, dtype=dtype).view()
+        self.weights.flags.writeable = False
+        self.biases.flags.writeable = False
 
     def __call__(self, X: ArrayNxM[numpy.floating]) -> ArrayNxM[numpy.floating]:
-        _X = numpy.asarray(X)
-        out = _X @ self.weights
+        # cast the input to the weights type so that the single-precision
+        # GEMM is used, then apply bias and activation without new buffers
+        _X = numpy.asarray(X, dtype=self.weights.dtype)
+        out = numpy.matmul(_X, self.weights)
         out += self.biases
-
         if self.activation:
-            return relu(out, out=out)
-        else:
-            return out
+            relu(out, out=out)
+        return out
 
 
 class CentroidLayer(Layer):
     def __init__(self, centroids: ArrayNxM[numpy.floating]) -> None:
         self.centroids = numpy.asarray(centroids)
         self.r2 = numpy.sum(self.centroids**2, axis=1).reshape(-1, 1).T
+        # the squared norm of each input row is constant along its row of
+        # the distance matrix, so it can be skipped without changing the
+        # argmin; fold the -2 factor in the projection matrix instead
+        self.weights = numpy.ascontiguousarray(-2 * self.centroids.T)
+
     def __call__(self, X: ArrayNxM[numpy.floating]) -> ArrayN[numpy.uint8]:
-        # compute pairwise squared distance matrix
-        r1 = numpy.sum(X**2, axis=1).reshape(-1, 1)
-        D = r1 - 2 * X @ self.centroids.T + self.r2
+        # compute pairwise squared distances up to a per-row offset
+        D = numpy.matmul(X, self.weights)
+        D += self.r2
         # find closest centroid
         states = numpy.empty(D.shape[0], dtype=numpy.uint8)
         D.argmin(axis=1, out=states)
@@ -64,4 +74,6 @@ class Model:
     def __init__(self, layers: Iterable[Layer] = ()):
         self.layers = list(layers)
     def __call__(self, X: ArrayNxM[numpy.floating]) -> ArrayNxM[numpy.floating]:
-        return functools.reduce(lambda x, f: f(x), self.layers, X)
+        for layer in self.layers:
+            X = layer(X)
+        return X
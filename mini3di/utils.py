@@ -19,8 +19,16 @@ if typing.TYPE_CHECKING:
 
 
 def normalize(x: numpy.ndarray[numpy.number], *, inplace=False):
-    norm = numpy.linalg.norm(x, axis=-1).reshape(*x.shape[:-1], 1)
-    return numpy.divide(x, norm, out=x if inplace else None, where=norm != 0)
+    # compute the norm with a fused multiply-reduce and an in-place root
+    norm = numpy.asarray(numpy.einsum("...i,...i->...", x, x))
+    if numpy.issubdtype(norm.dtype, numpy.inexact):
+        numpy.sqrt(norm, out=norm)
+    else:
+        norm = numpy.sqrt(norm)
+    norm = norm[..., None]
+    # vectors with a null norm are left untouched
+    out = x if inplace else x.astype(numpy.result_type(x, norm))
+    return numpy.divide(x, norm, out=out, where=norm != 0)
 
 
 def relu(
@@ -1,8 +1,9 @@
+import io
 import unittest
 
 import Bio.PDB
 import numpy
-from mini3di import Encoder, PartnerIndexEncoder, VirtualCenterEncoder
+from mini3di import Encoder, FeatureEncoder, PartnerIndexEncoder, VirtualCenterEncoder
 
 try:
     from importlib.resources import files as resource_files
@@ -10,6 +11,34 @@ except ImportError:
     from importlib_resources import files as resource_files
 
 
+POINT_MUTATION_PDB = """\
+ATOM      1  N   VAL A   2      34.073  13.737  -6.547  1.00 28.31           N
+ATOM      2  CA  VAL A   2      33.152  13.559  -5.393  1.00 23.48           C
+ATOM      3  C   VAL A   2      31.781  14.171  -5.689  1.00 16.45           C
+ATOM      4  CB  VAL A   2      33.724  14.108  -4.107  1.00 35.69           C
+ATOM      5  N   LYS A   3      30.706  13.614  -5.155  1.00 15.93           N
+ATOM      6  CA  LYS A   3      29.362  14.134  -5.338  1.00 13.50           C
+ATOM      7  C   LYS A   3      28.720  14.319  -3.952  1.00 12.18           C
+ATOM      8  CB  LYS A   3      28.527  13.141  -6.151  1.00 18.20           C
+ATOM      9  N  AGLY A   4      27.868  15.333  -3.851  0.50 12.48           N
+ATOM     10  CA AGLY A   4      27.168  15.609  -2.628  0.50  9.38           C
+ATOM     11  C  AGLY A   4      25.731  16.038  -2.980  0.50  9.15           C
+ATOM     12  N  BSER A   4      27.868  15.333  -3.851  0.50 12.48           N
+ATOM     13  CA BSER A   4      27.168  15.609  -2.628  0.50  9.38           C
+ATOM     14  C  BSER A   4      25.731  16.038  -2.980  0.50  9.15           C
+ATOM     15  CB BSER A   4      27.866  16.655  -1.813  0.50 13.10           C
+ATOM     16  N   VAL A   5      24.861  16.030  -1.995  1.00 10.24           N
+ATOM     17  CA  VAL A   5      23.437  16.346  -2.221  1.00  9.05           C
+ATOM     18  C   VAL A   5      22.881  16.966  -0.919  1.00  9.05           C
+ATOM     19  CB  VAL A   5      22.638  15.103  -2.622  1.00  9.69           C
+ATOM     20  N   CYS A   6      21.789  17.734  -1.084  1.00 10.15           N
+ATOM     21  CA  CYS A   6      21.056  18.270   0.063  1.00 10.03           C
+ATOM     22  C   CYS A   6      19.554  18.254  -0.260  1.00 10.30           C
+ATOM     23  CB  CYS A   6      21.428  19.604   0.838  1.00  8.66           C
+END
+"""
+
+
 class TestVirtualCenterEncoder(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
@@ -40,6 +69,16 @@ class TestVirtualCenterEncoder(unittest.TestCase):
         self.assertAlmostEqual(vc[0, 1], 17.8221, places=4)
         self.assertAlmostEqual(vc[0, 2], 2.01565, places=4)
 
+    def test_calc_virtual_center_identity(self):
+        encoder = VirtualCenterEncoder(theta=0.0, tau=0.0, distance_alpha_v=2.0)
+        ca = numpy.array([[34.826, 19.254, 17.339]])
+        cb = numpy.array([[35.285, 18.694, 15.994]])
+        n_ = numpy.array([[35.805, 19.041, 18.426]])
+
+        vc = encoder._compute_virtual_center(ca, cb, n_)
+        for i in range(3):
+            self.assertAlmostEqual(vc[0, i], ca[0, i] + 2.0 * (cb[0, i] - ca[0, i]))
+
     def test_encode_1xso_chainA(self):
         structure = self.get_structure("1xso")
         centers = self.encoder.encode_chain(structure[0]["A"], disordered_atom="last")
@@ -52,6 +91,21 @@ class TestVirtualCenterEncoder(unittest.TestCase):
         self.assertAlmostEqual(centers[4, 1], 17.8221, places=4)
         self.assertAlmostEqual(centers[4, 2], 2.01565, places=4)
 
+    def test_encode_point_mutation(self):
+        # residue 4 is a GLY/SER microheterogeneity, the SER is selected
+        structure = self.parser.get_structure("pm", io.StringIO(POINT_MUTATION_PDB))
+        centers = self.encoder.encode_chain(structure[0]["A"])
+        self.assertFalse(centers.mask.any())
+        # the result should be the same as with the selected residue only
+        lines = [
+            line.replace("BSER", " SER")
+            for line in POINT_MUTATION_PDB.splitlines(keepends=True)
+            if "AGLY" not in line
+        ]
+        structure = self.parser.get_structure("pm", io.StringIO("".join(lines)))
+        expected = self.encoder.encode_chain(structure[0]["A"])
+        self.assertTrue(numpy.array_equal(centers, expected))
+
 
 class TestPartnerIndexEncoder(unittest.TestCase):
     @classmethod
@@ -86,6 +140,31 @@ class TestPartnerIndexEncoder(unittest.TestCase):
             # fmt: on
         )
 
+    def test_encode_tiled(self):
+        # use tiny blocks so that chains span several blocks, including
+        # off-diagonal ones and an undersized trailing block
+        for tile_size in (7, 16):
+            encoder = PartnerIndexEncoder()
+            encoder._TILE_SIZE = tile_size
+            for name in ("1xso", "3bww.masked", "8crb"):
+                structure = self.get_structure(name)
+                for chain in structure[0]:
+                    with self.subTest(name=name, chain=chain.id, tile_size=tile_size):
+                        expected = self.encoder.encode_chain(chain)
+                        partners = encoder.encode_chain(chain)
+                        self.assertListEqual(list(partners), list(expected))
+
+
+class TestFeatureEncoder(unittest.TestCase):
+    def test_log_sequence_distance(self):
+        # restore the shared table after growing it
+        table = FeatureEncoder._log_table
+        self.addCleanup(setattr, FeatureEncoder, "_log_table", table)
+        d = numpy.arange(-3 * table.shape[0], 3 * table.shape[0] + 5)
+        log = FeatureEncoder._log_sequence_distance(d)
+        self.assertGreater(FeatureEncoder._log_table.shape[0], 3 * table.shape[0])
+        self.assertTrue(numpy.array_equal(log, numpy.log(numpy.abs(d) + 1)))
+
 
 class TestEncoder(unittest.TestCase):
     @classmethod
@@ -109,6 +188,26 @@ class TestEncoder(unittest.TestCase):
             "GTSPRDDTRIMTGMHDDD",
         )
 
+    def test_encode_atoms_lists(self):
+        structure = self.get_structure("1xso")
+        chain = structure[0]["A"]
+        residues = [r for r in chain.get_residues() if "CA" in r]
+        coords = {
+            name: [
+                r[name].coord.tolist() if name in r else [numpy.nan] * 3
+                for r in residues
+            ]
+            for name in ("CA", "CB", "N", "C")
+        }
+        states = self.encoder.encode_atoms(
+            ca=coords["CA"], cb=coords["CB"], n=coords["N"], c=coords["C"]
+        )
+        expected = self.encoder.encode_chain(chain)
+        self.assertEqual(
+            self.encoder.build_sequence(states),
+            self.encoder.build_sequence(expected),
+        )
+
     def test_encode_3bww(self):
         structure = self.get_structure("3bww")
         states = self.encoder.encode_chain(structure[0]["A"])
@@ -164,3 +263,16 @@ class TestEncoder(unittest.TestCase):
             "VQQCPKPLDDVTATNQSVQQIDDGDLDHDDDDDTIQGCPPPVRCSVVVVVVSVVSVVVSVVSCVVS"
             "VVVVVVD",
         )
+
+    def test_encode_chains(self):
+        structure = self.get_structure("8crb")
+        chains = list(structure[0])
+        batch = self.encoder.encode_chains(chains)
+        self.assertEqual(len(batch), len(chains))
+        for chain, states in zip(chains, batch):
+            expected = self.encoder.encode_chain(chain)
+            self.assertEqual(
+                self.encoder.build_sequence(states),
+                self.encoder.build_sequence(expected),
+            )
+        self.assertEqual(self.encoder.encode_chains([]), [])
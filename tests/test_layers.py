@@ -0,0 +1,20 @@
+import unittest
+
+import numpy
+from mini3di.layers import DenseLayer
+
+
+class TestDenseLayer(unittest.TestCase):
+    def test_integer_weights(self):
+        layer = DenseLayer([[1, 0], [0, 1]], [0.5, 0.5], activation=False)
+        out = layer([[0.7, 1.9]])
+        self.assertTrue(numpy.allclose(out, [[1.2, 2.4]]))
+
+    def test_float32_weights(self):
+        weights = numpy.array([[1.0, -1.0], [0.0, 2.0]], dtype=numpy.float32)
+        layer = DenseLayer(weights, [0.5, 0.5])
+        self.assertEqual(layer.weights.dtype, numpy.float32)
+        self.assertEqual(layer.biases.dtype, numpy.float32)
+        out = layer([[1.0, 1.0]])
+        self.assertEqual(out.dtype, numpy.float32)
+        self.assertTrue(numpy.array_equal(out, [[1.5, 1.5]]))
@@ -0,0 +1,22 @@
+import unittest
+
+import numpy
+from mini3di.utils import normalize
+
+
+class TestNormalize(unittest.TestCase):
+    def test_integer(self):
+        x = numpy.array([[3, 4], [0, 0]])
+        out = normalize(x)
+        self.assertTrue(numpy.allclose(out, [[0.6, 0.8], [0.0, 0.0]]))
+        self.assertTrue(numpy.array_equal(x, [[3, 4], [0, 0]]))
+
+    def test_single_vector(self):
+        out = normalize(numpy.array([3.0, 4.0]))
+        self.assertTrue(numpy.allclose(out, [0.6, 0.8]))
+
+    def test_inplace(self):
+        x = numpy.array([[3.0, 4.0], [0.0, 0.0]], dtype=numpy.float32)
+        out = normalize(x, inplace=True)
+        self.assertIs(out, x)
+        self.assertTrue(numpy.allclose(x, [[0.6, 0.8], [0.0, 0.0]]))